@@ -1,63 +1,112 @@
 import json
-from glob import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pandas as pd
 from termcolor import colored
 
+try:
+    # orjson parses bytes directly and is much faster on large logs.
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+LOG_FILENAMES = ("froggy.jsonl", "debug_gym.jsonl")
+
 
 def map_uuid(input):
-    if "pdb_agent_" in input:
-        input = input.replace("pdb_agent_", "pdb_")
-    return input
+    # str.replace returns the input itself when there is nothing to replace.
+    return input.replace("pdb_agent_", "pdb_")
+
+
+def find_log_files(path):
+    """Collect all log files under `path` in a single directory traversal."""
+    log_files = []
+    stack = [path]
+    # Symlinked directories are followed like glob does; guard against loops.
+    seen = set()
+    while stack:
+        dirpath = stack.pop()
+        try:
+            stat = os.stat(dirpath)
+            if (stat.st_dev, stat.st_ino) in seen:
+                continue
+            seen.add((stat.st_dev, stat.st_ino))
+            with os.scandir(dirpath) as it:
+                entries = list(it)
+        except OSError:
+            # Like glob, skip directories that cannot be read.
+            continue
+
+        for entry in entries:
+            # Like glob's `**`, don't descend into hidden directories.
+            if entry.name.startswith("."):
+                continue
+            # DirEntry caches the file type from readdir, so no extra stat.
+            if entry.is_dir():
+                stack.append(entry.path)
+            elif entry.name in LOG_FILENAMES:
+                log_files.append(entry.path)
+    return log_files
+
+
+def load_result(log_file):
+    """Parse a log once and keep only the fields needed for the summary."""
+    with open(log_file, "rb") as f:
+        data = json_loads(f.read())
+
+    return {
+        "success": data["success"],
+        "uuid": map_uuid(data["uuid"]),
+        "agent_type": data["agent_type"],
+        "problem": data["problem"],
+    }
 
 
 def main(args):
     # Collect all *.jsonl files in the output directory
-    for jsonl_name in ["froggy.jsonl", "debug_gym.jsonl"]:
-        log_files = glob(f"{args.path}/**/{jsonl_name}", recursive=True)
-        # Use pandas to read the logs
-        results = []
-        for log_file in sorted(log_files):
-            try:
-                with open(log_file, "r") as f:
-                    data = json.load(f)
-
-                result = {
-                    "success": data["success"],
-                    "uuid": map_uuid(data["uuid"]),
-                    "agent_type": data["agent_type"],
-                    "problem": data["problem"],
-                }
-                results.append(result)
-
-                if args.verbose:
-                    # Print agent_type, uuid, and problem colored by success, and path to the log.
-                    color = "green" if result["success"] else "red"
-                    if args.show_failed_only and result["success"]:
-                        continue
-
-                    print(
-                        colored(
-                            f"{result['agent_type']} {result['uuid']} {result['problem']}",
-                            color,
-                        ),
-                        f"\t({log_file})",
-                    )
-
-            except Exception as e:
-                print(colored(f"Error reading {log_file}. ({e!r})", "red"))
+    log_files = find_log_files(args.path)
+    # Logs are independent and reading them releases the GIL, so parse them concurrently.
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            log_file: executor.submit(load_result, log_file)
+            for log_file in sorted(log_files)
+        }
+
+    # Use pandas to read the logs
+    results = []
+    for log_file, future in futures.items():
+        try:
+            result = future.result()
+            results.append(result)
+
+            if args.verbose:
+                # Print agent_type, uuid, and problem colored by success, and path to the log.
+                color = "green" if result["success"] else "red"
+                if args.show_failed_only and result["success"]:
+                    continue
+
+                print(
+                    colored(
+                        f"{result['agent_type']} {result['uuid']} {result['problem']}",
+                        color,
+                    ),
+                    f"\t({log_file})",
+                )
+
+        except Exception as e:
+            print(colored(f"Error reading {log_file}. ({e!r})", "red"))
 
     df = pd.DataFrame(results)
 
-    # Group by agent type and uuid
-    grouped = df.groupby(["agent_type", "uuid"])
+    # Group by agent type and uuid, and aggregate all groups in one vectorized pass
+    summary = df.groupby(["agent_type", "uuid"])["success"].agg(["sum", "count"])
+    summary["rate"] = summary["sum"] / summary["count"]
 
     # Print success rate for each agent
-    for agent_type, group in grouped:
-        total = len(group)
-        nb_successes = group["success"].sum()
-        success_rate = nb_successes / total
+    for agent_type, nb_successes, total, success_rate in summary.itertuples():
         print(
             colored(f"{agent_type}: {success_rate:.2%} ({nb_successes} out of {total})")
         )
@@ -1,33 +1,74 @@
+import gzip
+import hashlib
 import json
 import os
+from pathlib import Path
 
-from flask import Flask, jsonify, redirect, render_template, request, url_for
+from flask import Flask, Response, jsonify, redirect, render_template, request, url_for
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.utils import secure_filename
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize responses with orjson, which is several times faster than json."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def json_loads(s):
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either.
+    return orjson.loads(s) if orjson is not None else json.loads(s)
+
+
+def json_dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode()
+
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+# Keep the key order of the log instead of sorting every dict in jsonify.
+app.json.sort_keys = False
 app.config["UPLOAD_FOLDER"] = "uploads"
 app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16MB max file size
 
 # Create uploads directory if it doesn't exist
 os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
 
-# Global variable to store loaded data
-data = None
-current_file = None
+# Everything derived from the loaded log, as one (index_html, steps, steps_gz,
+# step_etags) tuple. It is replaced in a single assignment on upload, so requests
+# served on other threads never mix two files. The parsed log itself is dropped.
+loaded = None
 
 
 def to_pretty_json(value):
-    return json.dumps(value, sort_keys=True, indent=4, separators=(",", ": "))
+    # orjson only supports 2-space indentation; use the same in the fallback.
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(value, option=option).decode()
+    return json.dumps(value, sort_keys=True, indent=2, separators=(",", ": "))
 
 
 app.jinja_env.filters["tojson_pretty"] = to_pretty_json
 
 
-@app.route("/")
-def index():
-    global data
-    if data is None:
-        return redirect(url_for("file_upload"))
+def load_log(filepath, filename):
+    """Load an uploaded log and precompute what the views serve from it."""
+    global loaded
+
+    # Parse the raw bytes directly, without decoding them to a str first.
+    data = json_loads(Path(filepath).read_bytes())
 
     # Pass metadata to the template
     metadata = {
@@ -36,19 +77,35 @@ def index():
         "uuid": data["uuid"],
         "success": data["success"],
     }
-    total_steps = len(data["log"])
-    return render_template(
+    # Serialize each step once so /get_step never encodes JSON per request.
+    # Uploads are bounded by MAX_CONTENT_LENGTH, and so is this list.
+    steps = tuple(json_dumps(step) for step in data["log"])
+    # Step JSON compresses well, so also gzip each step once for clients that accept it.
+    steps_gz = tuple(gzip.compress(step, compresslevel=5) for step in steps)
+    # Strong ETags derived from the content, so identical steps revalidate across uploads.
+    step_etags = tuple(hashlib.sha1(step).hexdigest() for step in steps)
+    # The page only depends on the loaded log, so render it once per upload.
+    index_html = render_template(
         "index.html",
         metadata=metadata,
-        total_steps=total_steps,
-        current_file=current_file,
+        total_steps=len(steps),
+        current_file=filename,
     )
 
+    loaded = (index_html, steps, steps_gz, step_etags)
+
+
+@app.route("/")
+def index():
+    current = loaded
+    if current is None:
+        return redirect(url_for("file_upload"))
+    index_html, _, _, _ = current
+    return index_html
+
 
 @app.route("/upload", methods=["GET", "POST"])
 def file_upload():
-    global data, current_file
-
     if request.method == "POST":
         if "file" not in request.files:
             return render_template("upload.html", error="No file selected")
@@ -65,9 +122,7 @@ def file_upload():
             file.save(filepath)
 
             try:
-                with open(filepath, "r") as f:
-                    data = json.load(f)
-                current_file = filename
+                load_log(filepath, filename)
                 return redirect(url_for("index"))
             except json.JSONDecodeError:
                 return render_template("upload.html", error="Invalid JSON file")
@@ -85,14 +140,27 @@ def file_upload():
 
 @app.route("/get_step/<int:step_id>")
 def get_step(step_id):
-    global data
-    if data is None:
+    # Read the shared state once so a concurrent upload cannot swap it mid-request.
+    current = loaded
+    if current is None:
         return jsonify({"error": "No file loaded"}), 400
+    _, steps, steps_gz, step_etags = current
 
     # Return the specific step data as JSON
-    if 0 <= step_id < len(data["log"]):
-        step = data["log"][step_id]
-        return jsonify(step)
+    # The `int` converter is unsigned, so negative ids never reach this view.
+    if step_id < len(steps):
+        etag = step_etags[step_id]
+        if request.accept_encodings["gzip"]:
+            response = Response(steps_gz[step_id], mimetype="application/json")
+            response.content_encoding = "gzip"
+            etag += "-gz"
+        else:
+            response = Response(steps[step_id], mimetype="application/json")
+        response.vary.add("Accept-Encoding")
+        # A new upload can change the step behind this URL, so always revalidate.
+        response.cache_control.no_cache = True
+        response.set_etag(etag)
+        return response.make_conditional(request)
     return jsonify({"error": "Step not found"}), 404
 
 
@@ -102,4 +170,14 @@ def change_file():
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0")
+    if os.environ.get("VIEWER_DEBUG") == "1":
+        # The debugger and reloader are only available on Flask's server.
+        app.run(host="0.0.0.0", debug=True)
+    else:
+        try:
+            from waitress import serve
+        except ImportError:
+            # Fall back to Flask's development server (threaded by default).
+            app.run(host="0.0.0.0")
+        else:
+            serve(app, host="0.0.0.0", port=5000, threads=8)
@@ -1,4 +1,4 @@
-from pathlib import Path
+import hashlib
 from unittest.mock import MagicMock, call, patch
 
 import numpy as np
@@ -189,17 +189,22 @@ def test_env_tools():
     assert env.tools == [tool1, tool2]
 
 
-@pytest.fixture
-def env(tmp_path):
-    tmp_path = Path(tmp_path)
-    repo_path = tmp_path / "repo"
+@pytest.fixture(scope="module")
+def repo_path(tmp_path_factory):
+    # RepoEnv only reads from `path` and works on its own copy, so the
+    # source repo can be shared by all tests in this module.
+    repo_path = tmp_path_factory.mktemp("env") / "repo"
     repo_path.mkdir()
     subdir_path = repo_path / "subdir"
     subdir_path.mkdir()
     (repo_path / "file1.txt").touch()
     (repo_path / "file2.txt").touch()
     (subdir_path / "subfile1.txt").touch()
+    return repo_path
+
 
+@pytest.fixture
+def env(repo_path):
     env = RepoEnv(path=repo_path, dir_tree_depth=2)
     return env
 
@@ -212,7 +217,7 @@ def test_restore(env):
 
     def hash_file(file):
         with open(file, "rb") as f:
-            return hash(f.read())
+            return hashlib.file_digest(f, "blake2b").digest()
 
     assert hash_file(env.path / "file1.txt") != hash_file(file1)
     env.restore()
@@ -284,16 +289,7 @@ def test_step(
     assert isinstance(infos, EnvInfo)
 
 
-def test_directory_tree(tmp_path):
-    tmp_path = Path(tmp_path)
-    repo_path = tmp_path / "repo"
-    repo_path.mkdir()
-    subdir_path = repo_path / "subdir"
-    subdir_path.mkdir()
-    (repo_path / "file1.txt").touch()
-    (repo_path / "file2.txt").touch()
-    (subdir_path / "subfile1.txt").touch()
-
+def test_directory_tree(repo_path):
     env = RepoEnv(path=repo_path, dir_tree_depth=3)
     result = env.directory_tree()
     expected_result = (